@@ -86,6 +86,7 @@ def pytest_configure(config):
         "pvtest",
         "allow_unclosed",
         "allow_unclosed_pyside2",
+        "xdist_group",
     ):
         config.addinivalue_line("markers", marker)
 
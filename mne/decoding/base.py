@@ -121,13 +121,16 @@ class LinearModel(BaseEstimator):
         self.model.fit(X, y, **fit_params)
 
         # Computes patterns using Haufe's trick: A = Cov_X . W . Precision_Y
-
+        # The data are centered here, so the covariances are plain products
+        # (np.cov would copy and center them again). Center in at least
+        # float64 precision like np.cov does, so patterns_ keeps its dtype.
         inv_Y = 1.0
-        X = X - X.mean(0, keepdims=True)
+        X = X - X.mean(0, keepdims=True, dtype=np.result_type(X, np.float64))
         if y.ndim == 2 and y.shape[1] != 1:
-            y = y - y.mean(0, keepdims=True)
-            inv_Y = np.linalg.pinv(np.cov(y.T))
-        self.patterns_ = np.cov(X.T).dot(self.filters_.T.dot(inv_Y)).T
+            y = y - y.mean(0, keepdims=True, dtype=np.result_type(y, np.float64))
+            inv_Y = np.linalg.pinv(np.dot(y.T, y) / (len(y) - 1))
+        cov_X = np.dot(X.T, X) / (len(X) - 1)
+        self.patterns_ = cov_X.dot(self.filters_.T.dot(inv_Y)).T
 
         return self
 
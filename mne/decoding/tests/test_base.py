@@ -3,6 +3,9 @@
 #
 # License: BSD-3-Clause
 
+from functools import lru_cache
+from itertools import product
+
 import numpy as np
 import pytest
 from numpy.testing import (
@@ -26,8 +29,25 @@ from mne.decoding.search_light import SlidingEstimator
 
 pytest.importorskip("sklearn")
 
+from sklearn import base as skbase  # noqa: E402
+from sklearn import svm  # noqa: E402
+from sklearn.linear_model import (  # noqa: E402
+    LinearRegression,
+    LogisticRegression,
+    Ridge,
+)
+from sklearn.model_selection import (  # noqa: E402
+    GridSearchCV,
+    KFold,
+    StratifiedKFold,
+    cross_val_score,
+)
+from sklearn.pipeline import make_pipeline  # noqa: E402
+from sklearn.preprocessing import StandardScaler  # noqa: E402
+from sklearn.utils.estimator_checks import check_estimator  # noqa: E402
+
 
-def _make_data(n_samples=1000, n_features=5, n_targets=3):
+def _make_data(n_samples=1000, n_features=5, n_targets=3, dtype=np.float64):
     """Generate some testing data.
 
     Parameters
@@ -38,6 +58,8 @@ def _make_data(n_samples=1000, n_features=5, n_targets=3):
         The number of features.
     n_targets : int
         The number of targets.
+    dtype : numpy dtype
+        The dtype of the returned arrays.
 
     Returns
     -------
@@ -49,61 +71,60 @@ def _make_data(n_samples=1000, n_features=5, n_targets=3):
         The forward model, mapping the latent variables (=Y) to the measured
         data (=X).
     """
+    return _make_data_cached(n_samples, n_features, n_targets, np.dtype(dtype))
+
+
+@lru_cache(maxsize=None)
+def _make_data_cached(n_samples, n_features, n_targets, dtype):
     # Define Y latent factors
-    np.random.seed(0)
-    cov_Y = np.eye(n_targets) * 10 + np.random.rand(n_targets, n_targets)
+    rng = np.random.default_rng(0)
+    cov_Y = np.eye(n_targets) * 10 + rng.random((n_targets, n_targets))
     cov_Y = (cov_Y + cov_Y.T) / 2.0
-    mean_Y = np.random.rand(n_targets)
-    Y = np.random.multivariate_normal(mean_Y, cov_Y, size=n_samples)
+    mean_Y = rng.random(n_targets)
+    # cov_Y is SPD, so a Cholesky factor is cheaper than multivariate_normal
+    L = np.linalg.cholesky(cov_Y)
+    Y = mean_Y + rng.standard_normal((n_samples, n_targets)) @ L.T
 
     # The Forward model
-    A = np.random.randn(n_features, n_targets)
+    A = rng.standard_normal((n_features, n_targets))
 
     X = Y.dot(A.T)
-    X += np.random.randn(n_samples, n_features)  # add noise
-    X += np.random.rand(n_features)  # Put an offset
+    X += rng.standard_normal((n_samples, n_features))  # add noise
+    X += rng.random(n_features)  # Put an offset
+    X, Y, A = (arr.astype(dtype, copy=False) for arr in (X, Y, A))
 
+    # The outputs are shared between tests, so make them read-only
+    for arr in (X, Y, A):
+        arr.flags.writeable = False
     return X, Y, A
 
 
 def test_get_coef():
     """Test getting linear coefficients (filters/patterns) from estimators."""
-    from sklearn import svm
-    from sklearn.base import (
-        BaseEstimator,
-        TransformerMixin,
-        is_classifier,
-        is_regressor,
-    )
-    from sklearn.linear_model import Ridge
-    from sklearn.model_selection import GridSearchCV
-    from sklearn.pipeline import make_pipeline
-    from sklearn.preprocessing import StandardScaler
-
     lm_classification = LinearModel()
-    assert is_classifier(lm_classification)
+    assert skbase.is_classifier(lm_classification)
 
     lm_regression = LinearModel(Ridge())
-    assert is_regressor(lm_regression)
+    assert skbase.is_regressor(lm_regression)
 
-    parameters = {"kernel": ["linear"], "C": [1, 10]}
+    parameters = {"kernel": ["linear"], "C": [1.0]}
     lm_gs_classification = LinearModel(
         GridSearchCV(svm.SVC(), parameters, cv=2, refit=True, n_jobs=None)
     )
-    assert is_classifier(lm_gs_classification)
+    assert skbase.is_classifier(lm_gs_classification)
 
     lm_gs_regression = LinearModel(
         GridSearchCV(svm.SVR(), parameters, cv=2, refit=True, n_jobs=None)
     )
-    assert is_regressor(lm_gs_regression)
+    assert skbase.is_regressor(lm_gs_regression)
 
     # Define a classifier, an invertible transformer and an non-invertible one.
 
-    class Clf(BaseEstimator):
+    class Clf(skbase.BaseEstimator):
         def fit(self, X, y):
             return self
 
-    class NoInv(TransformerMixin):
+    class NoInv(skbase.TransformerMixin):
         def fit(self, X, y):
             return self
 
@@ -153,7 +174,7 @@ def test_get_coef():
     ):
         # generate some categorical/continuous data
         # according to the type of estimator.
-        if is_classifier(clf):
+        if skbase.is_classifier(clf):
             n, n_features = 1000, 3
             X = rng.rand(n, n_features)
             y = np.arange(n) % 2
@@ -185,7 +206,7 @@ def test_get_coef():
         patterns = get_coef(clf, "patterns_", False)
         assert filters[0] != patterns[0]
         n_chans = X.shape[1]
-        assert_array_equal(filters.shape, patterns.shape, [n_chans, n_chans])
+        assert filters.shape == patterns.shape == (n_chans,)
 
     # Inverse transform linear model
     filters_inv = get_coef(clf, "filters_", True)
@@ -199,7 +220,7 @@ class _Noop(BaseEstimator, TransformerMixin):
         return self
 
     def transform(self, X):
-        return X.copy()
+        return X
 
     inverse_transform = transform
 
@@ -214,9 +235,6 @@ class _Noop(BaseEstimator, TransformerMixin):
 )
 def test_get_coef_inverse_transform(inverse, Scale, kwargs):
     """Test get_coef with and without inverse_transform."""
-    from sklearn.linear_model import Ridge
-    from sklearn.pipeline import make_pipeline
-
     lm_regression = LinearModel(Ridge())
     X, y, A = _make_data(n_samples=1000, n_features=3, n_targets=1)
     # Check with search_light and combination of preprocessing ending with sl:
@@ -224,12 +242,16 @@ def test_get_coef_inverse_transform(inverse, Scale, kwargs):
     # XXX : line above should work but does not as only last step is
     # used in get_coef ...
     slider = SlidingEstimator(make_pipeline(lm_regression))
-    X = np.transpose([X, -X], [1, 2, 0])  # invert X across 2 time samples
+    # invert X across 2 time samples
+    X_pair = np.empty(X.shape + (2,), X.dtype)
+    X_pair[..., 0] = X
+    np.negative(X, out=X_pair[..., 1])
+    X = X_pair
     clf = make_pipeline(Scale(**kwargs), slider)
     clf.fit(X, y)
     patterns = get_coef(clf, "patterns_", inverse)
     filters = get_coef(clf, "filters_", inverse)
-    assert_array_equal(filters.shape, patterns.shape, X.shape[1:])
+    assert filters.shape == patterns.shape == X.shape[1:]
     # the two time samples get inverted patterns
     assert_equal(patterns[0, 0], -patterns[0, 1])
     for t in [0, 1]:
@@ -240,50 +262,78 @@ def test_get_coef_inverse_transform(inverse, Scale, kwargs):
             assert_array_equal(filters_t, filters[:, t])
 
 
-@pytest.mark.parametrize("n_features", [1, 5])
-@pytest.mark.parametrize("n_targets", [1, 3])
-def test_get_coef_multiclass(n_features, n_targets):
+@pytest.fixture(
+    scope="module",
+    params=list(product([1, 5], [1, 3])),
+    ids=lambda p: f"{p[0]}x{p[1]}",
+)
+def multiclass_fitted(request):
+    """Fit the multiclass estimators once per (n_features, n_targets)."""
+    n_features, n_targets = request.param
+    X, Y, A = _make_data(
+        n_samples=500, n_features=n_features, n_targets=n_targets, dtype=np.float32
+    )
+    lm_ols = LinearModel(LinearRegression()).fit(X, Y)
+    lm = LinearModel(Ridge(alpha=0))
+    clf = make_pipeline(lm).fit(X, Y)
+    return clf, lm, lm_ols, X, Y, A
+
+
+def _make_epochs_pipeline(n_features):
+    info = create_info(n_features, 1000.0, "eeg")
+    lm = LinearModel(Ridge(alpha=1))
+    clf = make_pipeline(
+        Scaler(info, scalings=dict(eeg=1.0)),  # XXX adding this step breaks
+        Vectorizer(),
+        lm,
+    )
+    return clf, lm
+
+
+def test_get_coef_multiclass_shapes(multiclass_fitted):
     """Test get_coef on multiclass problems."""
     # Check patterns with more than 1 regressor
-    from sklearn.linear_model import LinearRegression, Ridge
-    from sklearn.pipeline import make_pipeline
-
-    X, Y, A = _make_data(n_samples=30000, n_features=n_features, n_targets=n_targets)
-    lm = LinearModel(LinearRegression()).fit(X, Y)
-    assert_array_equal(lm.filters_.shape, lm.patterns_.shape)
+    clf, lm, lm_ols, X, Y, A = multiclass_fitted
+    n_features, n_targets = A.shape
     if n_targets == 1:
         want_shape = (n_features,)
     else:
         want_shape = (n_targets, n_features)
-    assert_array_equal(lm.filters_.shape, want_shape)
-    if n_features > 1 and n_targets > 1:
-        assert_array_almost_equal(A, lm.patterns_.T, decimal=2)
-    lm = LinearModel(Ridge(alpha=0))
-    clf = make_pipeline(lm)
-    clf.fit(X, Y)
-    if n_features > 1 and n_targets > 1:
-        assert_allclose(A, lm.patterns_.T, atol=2e-2)
+    assert lm_ols.filters_.shape == lm_ols.patterns_.shape == want_shape
     coef = get_coef(clf, "patterns_", inverse_transform=True)
     assert_allclose(lm.patterns_, coef, atol=1e-5)
 
+
+def test_get_coef_multiclass_epochs(multiclass_fitted):
+    """Test get_coef on multiclass problems with epochs-shaped data."""
+    _, _, _, X, Y, A = multiclass_fitted
+    n_features, n_targets = A.shape
     # With epochs, scaler, and vectorizer (typical use case)
     X_epo = X.reshape(X.shape + (1,))
-    info = create_info(n_features, 1000.0, "eeg")
-    lm = LinearModel(Ridge(alpha=1))
-    clf = make_pipeline(
-        Scaler(info, scalings=dict(eeg=1.0)),  # XXX adding this step breaks
-        Vectorizer(),
-        lm,
-    )
+    clf, lm = _make_epochs_pipeline(n_features)
     clf.fit(X_epo, Y)
-    if n_features > 1 and n_targets > 1:
-        assert_allclose(A, lm.patterns_.T, atol=2e-2)
     coef = get_coef(clf, "patterns_", inverse_transform=True)
     lm_patterns_ = lm.patterns_[..., np.newaxis]
     assert_allclose(lm_patterns_, coef, atol=1e-5)
 
-    # Check can pass fitting parameters
-    lm.fit(X, Y, sample_weight=np.ones(len(Y)))
+    # Check can pass fitting parameters (a few samples suffice)
+    lm.fit(X[:100], Y[:100], sample_weight=np.ones(100))
+
+
+@pytest.mark.slowtest
+def test_get_coef_multiclass_recovery():
+    """Test that multiclass patterns recover the forward model."""
+    n_features, n_targets = 5, 3
+    X, Y, A = _make_data(
+        n_samples=30000, n_features=n_features, n_targets=n_targets, dtype=np.float32
+    )
+    lm = LinearModel(LinearRegression()).fit(X, Y)
+    assert_array_almost_equal(A, lm.patterns_.T, decimal=2)
+    lm = LinearModel(Ridge(alpha=0)).fit(X, Y)
+    assert_allclose(A, lm.patterns_.T, atol=2e-2)
+    clf, lm = _make_epochs_pipeline(n_features)
+    clf.fit(X.reshape(X.shape + (1,)), Y)
+    assert_allclose(A, lm.patterns_.T, atol=2e-2)
 
 
 @pytest.mark.parametrize(
@@ -297,10 +347,6 @@ def test_get_coef_multiclass(n_features, n_targets):
 )
 def test_get_coef_multiclass_full(n_classes, n_channels, n_times):
     """Test a full example with pattern extraction."""
-    from sklearn.linear_model import LogisticRegression
-    from sklearn.model_selection import StratifiedKFold
-    from sklearn.pipeline import make_pipeline
-
     data = np.zeros((10 * n_classes, n_channels, n_times))
     # Make only the first channel informative
     for ii in range(n_classes):
@@ -336,65 +382,52 @@ def test_get_coef_multiclass_full(n_classes, n_channels, n_times):
 def test_linearmodel():
     """Test LinearModel class for computing filters and patterns."""
     # check categorical target fit in standard linear model
-    from sklearn.linear_model import LinearRegression
-
     rng = np.random.RandomState(0)
     clf = LinearModel()
     n, n_features = 20, 3
     X = rng.rand(n, n_features)
     y = np.arange(n) % 2
+    # any 3D array is invalid input, so one can be shared by all checks below
+    wrong_X = rng.rand(n, n_features, 99)
     clf.fit(X, y)
-    assert_equal(clf.filters_.shape, (n_features,))
-    assert_equal(clf.patterns_.shape, (n_features,))
+    assert clf.filters_.shape == clf.patterns_.shape == (n_features,)
     with pytest.raises(ValueError):
-        wrong_X = rng.rand(n, n_features, 99)
         clf.fit(wrong_X, y)
 
     # check categorical target fit in standard linear model with GridSearchCV
-    from sklearn import svm
-    from sklearn.model_selection import GridSearchCV
-
-    parameters = {"kernel": ["linear"], "C": [1, 10]}
+    parameters = {"kernel": ["linear"], "C": [1.0]}
     clf = LinearModel(
         GridSearchCV(svm.SVC(), parameters, cv=2, refit=True, n_jobs=None)
     )
     clf.fit(X, y)
-    assert_equal(clf.filters_.shape, (n_features,))
-    assert_equal(clf.patterns_.shape, (n_features,))
+    assert clf.filters_.shape == clf.patterns_.shape == (n_features,)
     with pytest.raises(ValueError):
-        wrong_X = rng.rand(n, n_features, 99)
         clf.fit(wrong_X, y)
 
     # check continuous target fit in standard linear model with GridSearchCV
-    n_targets = 1
-    Y = rng.rand(n, n_targets)
     clf = LinearModel(
         GridSearchCV(svm.SVR(), parameters, cv=2, refit=True, n_jobs=None)
     )
     clf.fit(X, y)
-    assert_equal(clf.filters_.shape, (n_features,))
-    assert_equal(clf.patterns_.shape, (n_features,))
+    assert clf.filters_.shape == clf.patterns_.shape == (n_features,)
     with pytest.raises(ValueError):
-        wrong_y = rng.rand(n, n_features, 99)
-        clf.fit(X, wrong_y)
+        clf.fit(X, wrong_X)
 
     # check multi-target fit in standard linear model
     n_targets = 5
     Y = rng.rand(n, n_targets)
     clf = LinearModel(LinearRegression())
     clf.fit(X, Y)
-    assert_equal(clf.filters_.shape, (n_targets, n_features))
-    assert_equal(clf.patterns_.shape, (n_targets, n_features))
+    assert clf.filters_.shape == clf.patterns_.shape == (n_targets, n_features)
+    # patterns are computed in float64 like np.cov, even for float32 input
+    clf.fit(X.astype(np.float32), Y.astype(np.float32))
+    assert clf.patterns_.dtype == np.float64
     with pytest.raises(ValueError):
-        wrong_y = rng.rand(n, n_features, 99)
-        clf.fit(X, wrong_y)
+        clf.fit(X, wrong_X)
 
 
 def test_cross_val_multiscore():
     """Test cross_val_multiscore for computing scores on decoding over time."""
-    from sklearn.linear_model import LinearRegression, LogisticRegression
-    from sklearn.model_selection import KFold, StratifiedKFold, cross_val_score
-
     logreg = LogisticRegression(solver="liblinear", random_state=0)
 
     # compare to cross-val-score
@@ -411,26 +444,28 @@ def test_cross_val_multiscore():
     y = np.arange(20) % 2
     clf = SlidingEstimator(logreg, scoring="accuracy")
     scores_acc = cross_val_multiscore(clf, X, y, cv=cv)
-    assert_array_equal(np.shape(scores_acc), [2, 3])
-
-    # check values
-    scores_acc_manual = list()
-    for train, test in cv.split(X, y):
-        clf.fit(X[train], y[train])
-        scores_acc_manual.append(clf.score(X[test], y[test]))
-    assert_array_equal(scores_acc, scores_acc_manual)
+    assert scores_acc.shape == (2, 3)
 
     # check scoring metric
     # raise an error if scoring is defined at cross-val-score level and
     # search light, because search light does not return a 1-dimensional
     # prediction.
     pytest.raises(ValueError, cross_val_multiscore, clf, X, y, cv=cv, scoring="roc_auc")
-    clf = SlidingEstimator(logreg, scoring="roc_auc")
-    scores_auc = cross_val_multiscore(clf, X, y, cv=cv, n_jobs=None)
-    scores_auc_manual = list()
+    clf_auc = SlidingEstimator(logreg, scoring="roc_auc")
+    scores_auc = cross_val_multiscore(clf_auc, X, y, cv=cv, n_jobs=None)
+
+    # check values: fit once per fold and score both metrics, as the
+    # scoring of the search light is only used at score time
+    scores_acc_manual, scores_auc_manual = list(), list()
     for train, test in cv.split(X, y):
         clf.fit(X[train], y[train])
-        scores_auc_manual.append(clf.score(X[test], y[test]))
+        for scoring, manual in (
+            ("accuracy", scores_acc_manual),
+            ("roc_auc", scores_auc_manual),
+        ):
+            clf.set_params(scoring=scoring)
+            manual.append(clf.score(X[test], y[test]))
+    assert_array_equal(scores_acc, scores_acc_manual)
     assert_array_equal(scores_auc, scores_auc_manual)
 
     # indirectly test that cross_val_multiscore rightly detects the type of
@@ -441,22 +476,22 @@ def test_cross_val_multiscore():
     y[::2] = 0
     clf = logreg
     reg = LinearRegression()
+    # the reference folds only need to be enumerated once, while the automatic
+    # ones must still come from cv=2 since that's what we are testing
+    folds_strat = list(StratifiedKFold(2).split(X, y))
+    folds = list(KFold(2).split(X, y))
     for cross_val in (cross_val_score, cross_val_multiscore):
-        manual = cross_val(clf, X, y, cv=StratifiedKFold(2))
+        manual = cross_val(clf, X, y, cv=folds_strat)
         auto = cross_val(clf, X, y, cv=2)
         assert_array_equal(manual, auto)
 
-        manual = cross_val(reg, X, y, cv=KFold(2))
+        manual = cross_val(reg, X, y, cv=folds)
         auto = cross_val(reg, X, y, cv=2)
         assert_array_equal(manual, auto)
 
 
 def test_sklearn_compliance():
     """Test LinearModel compliance with sklearn."""
-    pytest.importorskip("sklearn")
-    from sklearn.linear_model import LogisticRegression
-    from sklearn.utils.estimator_checks import check_estimator
-
     lm = LinearModel(LogisticRegression())
     ignores = (
         "check_estimator_sparse_data",  # we densify
@@ -0,0 +1,85 @@
+# License: BSD-3-Clause
+
+import os
+from copy import deepcopy
+from functools import lru_cache, wraps
+from pathlib import Path
+
+import pytest
+
+from mne.io.bti import bti
+
+# The BTi readers reparse the same few files in nearly every test, so memoize
+# them (and the channel renaming that follows) while the BTi tests run. For
+# the readers only file paths and flags are cached (file-like objects fall
+# through to the real function), and every hit returns a deep copy because
+# callers modify the parsed dicts in place.
+_CACHED_READERS = (
+    "_read_bti_header",
+    "_read_config",
+    "_read_head_shape",
+    "_rename_channels",
+)
+_orig_readers = {name: getattr(bti, name) for name in _CACHED_READERS}
+
+
+@lru_cache(maxsize=32)
+def _read_cached(name, args, kwargs, mtimes):
+    return _orig_readers[name](*args, **dict(kwargs))
+
+
+def _cache_key(value, fname_str):
+    """Return a hashable stand-in for ``value`` and its mtime, or None."""
+    if isinstance(value, os.PathLike) or (fname_str and isinstance(value, str)):
+        value = str(Path(value).resolve())
+        return value, os.stat(value).st_mtime_ns
+    if fname_str and not isinstance(value, (bool, type(None))):
+        return None  # e.g., a BytesIO, which can change under the same key
+    if isinstance(value, list):
+        value = tuple(value)
+    try:
+        hash(value)
+    except TypeError:
+        return None
+    return value, None
+
+
+def _make_cached(name):
+    func = _orig_readers[name]
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        # only the readers take strings as file names
+        fname_str = name != "_rename_channels"
+        keys = [_cache_key(arg, fname_str) for arg in args]
+        keys += [_cache_key(val, fname_str) for val in kwargs.values()]
+        # _read_bti_header calls _read_config, so don't reuse its output
+        # while a test has replaced the latter with something else
+        inner_patched = name == "_read_bti_header" and not getattr(
+            bti._read_config, "_bti_cached", False
+        )
+        if inner_patched or any(key is None for key in keys):
+            return func(*args, **kwargs)
+        args = tuple(key[0] for key in keys[: len(args)])
+        kwargs = tuple(zip(kwargs, (key[0] for key in keys[len(args) :])))
+        mtimes = tuple(key[1] for key in keys)
+        return deepcopy(_read_cached(name, args, kwargs, mtimes))
+
+    wrapper._bti_cached = True
+    return wrapper
+
+
+_cached_readers = {name: _make_cached(name) for name in _CACHED_READERS}
+
+
+# Module scope so that the patch is in place for module-scoped fixtures too,
+# and the real readers are restored before any other test module runs.
+# Tests must call the readers through the module (``bti._read_config(...)``)
+# to hit the cache; names imported directly are the uncached originals.
+@pytest.fixture(scope="module", autouse=True)
+def _cache_bti_readers():
+    """Serve repeated BTi file reads and channel renaming from a cache."""
+    with pytest.MonkeyPatch.context() as mp:
+        for name, reader in _cached_readers.items():
+            mp.setattr(bti, name, reader)
+        yield
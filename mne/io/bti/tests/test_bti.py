@@ -4,7 +4,7 @@
 
 import os
 from collections import Counter
-from functools import partial, reduce
+from functools import partial
 from io import BytesIO
 from pathlib import Path
 
@@ -24,16 +24,15 @@ from mne._fiff.constants import FIFF
 from mne.datasets import testing
 from mne.io import read_raw_bti, read_raw_fif
 from mne.io.bti.bti import (
+    # The readers cached by conftest.py (_read_bti_header, _read_config,
+    # _read_head_shape and _rename_channels) are not imported here on purpose:
+    # call them as mne.io.bti.bti._read_*(...) so that the cache applies
     _check_nan_dev_head_t,
     _convert_coil_trans,
     _correct_trans,
     _get_bti_dev_t,
     _get_bti_info,
     _loc_to_coil_trans,
-    _read_bti_header,
-    _read_config,
-    _read_head_shape,
-    _rename_channels,
 )
 from mne.io.tests.test_raw import _test_raw_reader
 from mne.transforms import Transform, combine_transforms, invert_transform
@@ -46,7 +45,7 @@ pdf_fnames = [base_dir / f"test_pdf_{a}" for a in archs]
 config_fnames = [base_dir / f"test_config_{a}" for a in archs]
 hs_fnames = [base_dir / f"test_hs_{a}" for a in archs]
 exported_fnames = [base_dir / f"exported4D_{a}_raw.fif" for a in archs]
-pdf_config_hs_exporteds = list(
+pdf_config_hs_exporteds = tuple(
     zip(pdf_fnames, config_fnames, hs_fnames, exported_fnames)
 )
 
@@ -58,6 +57,46 @@ fname_sim_filt = testing_path_bti / "4Dsim" / "c,rfDC,fn50,o"
 # the 4D exporter doesn't export all channels, so we confine our comparison
 NCH = 248
 
+# what a channel loc looks like when its device transform is missing
+_NAN12 = np.full(12, np.nan)
+_NAN12.setflags(write=False)
+
+
+def _get_chs_key(info, key, n_ch=NCH):
+    """Stack a per-channel entry of the first ``n_ch`` channels."""
+    return np.array([ch[key] for ch in info["chs"][:n_ch]])
+
+
+def _assert_trans_equal(a, b):
+    """Check two 4x4 transforms for exact equality, reporting only on failure."""
+    if not np.array_equal(a, b):
+        assert_array_equal(a, b)
+
+
+# Group each architecture so that with pytest-xdist (--dist loadgroup) all of
+# its tests run on one worker and share the module fixture below
+@pytest.fixture(
+    scope="module",
+    params=[
+        pytest.param(fnames, id=arch, marks=pytest.mark.xdist_group(f"bti_{arch}"))
+        for arch, fnames in zip(archs, pdf_config_hs_exporteds)
+    ],
+)
+def bti_raw(request):
+    """Read each architecture's BTi files once for the whole module.
+
+    Tests must not modify the returned objects in place (use copies).
+    """
+    pdf, config, hs, exported = request.param
+    return dict(
+        pdf=pdf,
+        config=config,
+        hs=hs,
+        exported=exported,
+        raw=read_raw_bti(pdf, config, hs, preload=False),
+        bti_info=mne.io.bti.bti._read_bti_header(pdf, config),
+    )
+
 
 @testing.requires_testing_data
 def test_read_2500():
@@ -68,9 +107,10 @@ def test_read_2500():
 def test_no_loc_none(monkeypatch):
     """Test that we don't set loc to None when no trans is found."""
     ch_name = "MLzA"
+    read_config = mne.io.bti.bti._read_config
 
     def _read_config_bad(*args, **kwargs):
-        cfg = _read_config(*args, **kwargs)
+        cfg = read_config(*args, **kwargs)
         idx = [ch["name"] for ch in cfg["chs"]].index(ch_name)
         del cfg["chs"][idx]["dev"]["transform"]
         return cfg
@@ -85,14 +125,14 @@ def test_no_loc_none(monkeypatch):
     )
     raw = read_raw_bti(**kwargs)
     idx = raw.ch_names.index(ch_name)
-    assert_allclose(raw.info["chs"][idx]["loc"], np.full(12, np.nan))
+    assert_allclose(raw.info["chs"][idx]["loc"], _NAN12)
 
 
 def test_read_config():
     """Test read bti config file."""
     # for config in config_fname, config_solaris_fname:
     for config in config_fnames:
-        cfg = _read_config(config)
+        cfg = mne.io.bti.bti._read_config(config)
         assert all(
             "unknown" not in block.lower() and block != ""
             for block in cfg["user_blocks"]
@@ -109,19 +149,18 @@ def test_crop_append():
     )
     y, t = raw[:]
     t0, t1 = 0.25 * t[-1], 0.75 * t[-1]
-    mask = (t0 <= t) * (t <= t1)
+    # number of samples in [t0, t1]
+    n_samp = np.searchsorted(t, t1, side="right") - np.searchsorted(t, t0)
     raw_ = raw.copy().crop(t0, t1)
     y_, _ = raw_[:]
-    assert y_.shape[1] == mask.sum()
+    assert y_.shape[1] == n_samp
     assert y_.shape[0] == y.shape[0]
 
 
-@pytest.mark.parametrize("pdf, config, hs, exported", pdf_config_hs_exporteds)
-def test_transforms(pdf, config, hs, exported):
+def test_transforms(bti_raw):
     """Test transformations."""
     bti_trans = (0.0, 0.02, 0.11)
-    bti_dev_t = Transform("ctf_meg", "meg", _get_bti_dev_t(0.0, bti_trans))
-    raw = read_raw_bti(pdf, config, hs, preload=False)
+    raw = bti_raw["raw"]
     dev_ctf_t = raw.info["dev_ctf_t"]
     dev_head_t_old = raw.info["dev_head_t"]
     ctf_head_t = raw.info["ctf_head_t"]
@@ -134,19 +173,19 @@ def test_transforms(pdf, config, hs, exported):
     # 3) get Neuromag->head
     dev_head_t_new = combine_transforms(t, ctf_head_t, "meg", "head")
 
-    assert_array_equal(dev_head_t_new["trans"], dev_head_t_old["trans"])
+    _assert_trans_equal(dev_head_t_new["trans"], dev_head_t_old["trans"])
 
 
 @pytest.mark.slowtest
-@pytest.mark.parametrize("pdf, config, hs, exported", pdf_config_hs_exporteds)
-def test_raw(pdf, config, hs, exported, tmp_path):
+def test_raw(bti_raw, tmp_path):
     """Test bti conversion to Raw object."""
+    pdf, config = bti_raw["pdf"], bti_raw["config"]
     # rx = 2 if 'linux' in pdf else 0
     pytest.raises(ValueError, read_raw_bti, pdf, "eggs", preload=False)
     pytest.raises(ValueError, read_raw_bti, pdf, config, "spam", preload=False)
     tmp_raw_fname = tmp_path / "tmp_raw.fif"
-    ex = read_raw_fif(exported, preload=True)
-    ra = read_raw_bti(pdf, config, hs, preload=False)
+    ex = read_raw_fif(bti_raw["exported"], preload=False)
+    ra = bti_raw["raw"]
     assert "RawBTi" in repr(ra)
     assert_equal(ex.ch_names[:NCH], ra.ch_names[:NCH])
     assert_array_almost_equal(
@@ -154,27 +193,13 @@ def test_raw(pdf, config, hs, exported, tmp_path):
     )
     assert len(ex.info["dig"]) in (3563, 5154)
     assert_dig_allclose(ex.info, ra.info, limit=100)
-    coil1, coil2 = [
-        np.concatenate([d["loc"].flatten() for d in r_.info["chs"][:NCH]])
-        for r_ in (ra, ex)
-    ]
-    assert_array_almost_equal(coil1, coil2, 7)
-
-    loc1, loc2 = [
-        np.concatenate([d["loc"].flatten() for d in r_.info["chs"][:NCH]])
-        for r_ in (ra, ex)
-    ]
+    loc1, loc2 = [_get_chs_key(r_.info, "loc") for r_ in (ra, ex)]
+    assert_array_almost_equal(loc1, loc2, 7)
     assert_allclose(loc1, loc2)
 
     assert_allclose(ra[:NCH][0], ex[:NCH][0])
-    assert_array_equal(
-        [c["range"] for c in ra.info["chs"][:NCH]],
-        [c["range"] for c in ex.info["chs"][:NCH]],
-    )
-    assert_array_equal(
-        [c["cal"] for c in ra.info["chs"][:NCH]],
-        [c["cal"] for c in ex.info["chs"][:NCH]],
-    )
+    for key in ("range", "cal"):
+        assert_array_equal(_get_chs_key(ra.info, key), _get_chs_key(ex.info, key))
     assert_array_equal(ra._cals[:NCH], ex._cals[:NCH])
 
     # check our transforms
@@ -187,12 +212,14 @@ def test_raw(pdf, config, hs, exported, tmp_path):
                 assert_allclose(ex.info[key][ent], ra.info[key][ent])
 
     # MNE-BIDS needs these
+    present = {entry.name for entry in os.scandir(base_dir) if entry.is_file()}
     for key in ("pdf_fname", "config_fname", "head_shape_fname"):
-        assert os.path.isfile(ra._raw_extras[0][key])
+        fname = Path(ra._raw_extras[0][key])
+        assert fname.parent == base_dir
+        assert fname.name in present
 
     ra.save(tmp_raw_fname)
     re = read_raw_fif(tmp_raw_fname)
-    print(re)
     for key in ("dev_head_t", "dev_ctf_t", "ctf_head_t"):
         assert isinstance(re.info[key], dict)
         this_t = re.info[key]["trans"]
@@ -201,9 +228,9 @@ def test_raw(pdf, config, hs, exported, tmp_path):
         assert not np.allclose(this_t, np.eye(4))
 
 
-@pytest.mark.parametrize("pdf, config, hs, exported", pdf_config_hs_exporteds)
-def test_info_no_rename_no_reorder_no_pdf(pdf, config, hs, exported):
+def test_info_no_rename_no_reorder_no_pdf(bti_raw):
     """Test private renaming, reordering and partial construction option."""
+    pdf, config, hs = bti_raw["pdf"], bti_raw["config"], bti_raw["hs"]
     info, bti_info = _get_bti_info(
         pdf_fname=pdf,
         config_fname=config,
@@ -255,11 +282,10 @@ def test_info_no_rename_no_reorder_no_pdf(pdf, config, hs, exported):
     assert_equal(info["ch_names"], info2["ch_names"])
     assert_equal(info["ch_names"], info2["ch_names"])
     for key in ["dev_ctf_t", "dev_head_t", "ctf_head_t"]:
-        assert_array_equal(info[key]["trans"], info2[key]["trans"])
+        _assert_trans_equal(info[key]["trans"], info2[key]["trans"])
 
     assert_array_equal(
-        np.array([ch["loc"] for ch in info["chs"]]),
-        np.array([ch["loc"] for ch in info2["chs"]]),
+        _get_chs_key(info, "loc", None), _get_chs_key(info2, "loc", None)
     )
 
     # just check reading data | corner case
@@ -270,7 +296,8 @@ def test_info_no_rename_no_reorder_no_pdf(pdf, config, hs, exported):
         sort_by_ch_name=False,
         preload=True,
     )
-    # just check reading data | corner case
+    # the sorted, unrenamed variant needs its own full read: reindexing raw1
+    # instead would make the comparison below tautological
     raw2 = read_raw_bti(
         pdf_fname=pdf,
         config_fname=config,
@@ -282,15 +309,15 @@ def test_info_no_rename_no_reorder_no_pdf(pdf, config, hs, exported):
 
     bti_ch_labels_1 = raw1._raw_extras[0]["bti_ch_labels"]
     bti_ch_labels_2 = raw2._raw_extras[0]["bti_ch_labels"]
-    sort_idx = [bti_ch_labels_1.index(ch) for ch in bti_ch_labels_2]
-    raw1._data = raw1._data[sort_idx]
-    assert_array_equal(raw1._data, raw2._data)
+    pos = {ch: ii for ii, ch in enumerate(bti_ch_labels_1)}
+    sort_idx = np.array([pos[ch] for ch in bti_ch_labels_2], dtype=np.intp)
+    assert_array_equal(raw1._data[sort_idx], raw2._data)
     assert_array_equal(bti_ch_labels_2, raw2.ch_names)
 
 
-@pytest.mark.parametrize("pdf, config, hs, exported", pdf_config_hs_exporteds)
-def test_no_conversion(pdf, config, hs, exported):
+def test_no_conversion(bti_raw):
     """Test bti no-conversion option."""
+    pdf, config, hs = bti_raw["pdf"], bti_raw["config"], bti_raw["hs"]
     get_info = partial(
         _get_bti_info,
         rotation_x=0.0,
@@ -303,91 +330,83 @@ def test_no_conversion(pdf, config, hs, exported):
     )
 
     raw_info, _ = get_info(pdf, config, hs, convert=False)
-    raw_info_con = read_raw_bti(
-        pdf_fname=pdf,
-        config_fname=config,
-        head_shape_fname=hs,
-        convert=True,
-        preload=False,
-    ).info
+    raw_info_con = bti_raw["raw"].info.copy()
 
-    pick_info(
-        raw_info_con, pick_types(raw_info_con, meg=True, ref_meg=True), copy=False
+    # the two infos order channels differently, so pick each once
+    picks, picks_con = (
+        pick_types(info, meg=True, ref_meg=True) for info in (raw_info, raw_info_con)
     )
-    pick_info(raw_info, pick_types(raw_info, meg=True, ref_meg=True), copy=False)
-    bti_info = _read_bti_header(pdf, config)
+    assert len(picks) == len(picks_con)
+    pick_info(raw_info, picks, copy=False)
+    pick_info(raw_info_con, picks_con, copy=False)
+    bti_info = bti_raw["bti_info"]
     dev_ctf_t = _correct_trans(bti_info["bti_transform"][0])
-    assert_array_equal(dev_ctf_t, raw_info["dev_ctf_t"]["trans"])
-    assert_array_equal(raw_info["dev_head_t"]["trans"], np.eye(4))
-    assert_array_equal(raw_info["ctf_head_t"]["trans"], np.eye(4))
+    _assert_trans_equal(dev_ctf_t, raw_info["dev_ctf_t"]["trans"])
+    _assert_trans_equal(raw_info["dev_head_t"]["trans"], np.eye(4))
+    _assert_trans_equal(raw_info["ctf_head_t"]["trans"], np.eye(4))
 
-    nasion, lpa, rpa, hpi, dig_points = _read_head_shape(hs)
+    nasion, lpa, rpa, hpi, dig_points = mne.io.bti.bti._read_head_shape(hs)
     dig, t, _ = _make_bti_dig_points(
         nasion, lpa, rpa, hpi, dig_points, convert=False, use_hpi=False
     )
 
-    assert_array_equal(t["trans"], np.eye(4))
+    _assert_trans_equal(t["trans"], np.eye(4))
 
-    for ii, (old, new, con) in enumerate(
-        zip(dig, raw_info["dig"], raw_info_con["dig"])
-    ):
-        assert_equal(old["ident"], new["ident"])
-        assert_array_equal(old["r"], new["r"])
-        assert not np.allclose(old["r"], con["r"])
-
-        if ii > 10:
-            break
+    # compare the first few points only
+    n_dig = 12
+    old, new, con = (d[:n_dig] for d in (dig, raw_info["dig"], raw_info_con["dig"]))
+    assert_equal([d["ident"] for d in old], [d["ident"] for d in new])
+    r_old, r_new, r_con = (np.array([d["r"] for d in ds]) for ds in (old, new, con))
+    assert_array_equal(r_old, r_new)
+    # every single point must have changed with the conversion
+    assert not np.isclose(r_old, r_con).all(axis=1).any()
 
     ch_map = {ch["chan_label"]: ch["loc"] for ch in bti_info["chs"]}
 
-    for ii, ch_label in enumerate(raw_info["ch_names"]):
-        if not ch_label.startswith("A"):
-            continue
-        t1 = ch_map[ch_label]  # correction already performed in bti_info
-        t2 = raw_info["chs"][ii]["loc"]
-        t3 = raw_info_con["chs"][ii]["loc"]
-        assert_allclose(t1, t2, atol=1e-15)
-        assert not np.allclose(t1, t3)
-        idx_a = raw_info_con["ch_names"].index("MEG 001")
-        idx_b = raw_info["ch_names"].index("A22")
-        assert_equal(raw_info_con["chs"][idx_a]["coord_frame"], FIFF.FIFFV_COORD_DEVICE)
-        assert_equal(
-            raw_info["chs"][idx_b]["coord_frame"], FIFF.FIFFV_MNE_COORD_4D_HEAD
-        )
-
-
-@pytest.mark.parametrize("pdf, config, hs, exported", pdf_config_hs_exporteds)
-def test_bytes_io(pdf, config, hs, exported):
+    a_idx = [ii for ii, ch in enumerate(raw_info["ch_names"]) if ch.startswith("A")]
+    assert len(a_idx) > 0
+    # correction already performed in bti_info
+    t1 = np.array([ch_map[raw_info["ch_names"][ii]] for ii in a_idx])
+    t2 = np.array([raw_info["chs"][ii]["loc"] for ii in a_idx])
+    t3 = np.array([raw_info_con["chs"][ii]["loc"] for ii in a_idx])
+    assert_allclose(t1, t2, atol=1e-15)
+    # every single channel must have changed with the conversion
+    assert not np.isclose(t1, t3).all(axis=1).any()
+    idx_a = raw_info_con["ch_names"].index("MEG 001")
+    idx_b = raw_info["ch_names"].index("A22")
+    assert_equal(raw_info_con["chs"][idx_a]["coord_frame"], FIFF.FIFFV_COORD_DEVICE)
+    assert_equal(raw_info["chs"][idx_b]["coord_frame"], FIFF.FIFFV_MNE_COORD_4D_HEAD)
+
+
+def test_bytes_io(bti_raw):
     """Test bti bytes-io API."""
-    raw = read_raw_bti(pdf, config, hs, convert=True, preload=False)
+    pdf, config, hs = bti_raw["pdf"], bti_raw["config"], bti_raw["hs"]
+    raw = bti_raw["raw"]
 
-    with open(pdf, "rb") as fid:
-        pdf = BytesIO(fid.read())
-    with open(config, "rb") as fid:
-        config = BytesIO(fid.read())
-    with open(hs, "rb") as fid:
-        hs = BytesIO(fid.read())
+    # BytesIO shares the buffer of the bytes it is created from, so this reads
+    # each file exactly once
+    pdf, config, hs = (BytesIO(Path(fname).read_bytes()) for fname in (pdf, config, hs))
 
     raw2 = read_raw_bti(pdf, config, hs, convert=True, preload=False)
     repr(raw2)
     assert_array_equal(raw[:][0], raw2[:][0])
 
 
-@pytest.mark.parametrize("hs", hs_fnames)
+@pytest.mark.parametrize("hs", hs_fnames, ids=archs)
 def test_setup_headshape(hs):
     """Test reading bti headshape."""
-    nasion, lpa, rpa, hpi, dig_points = _read_head_shape(hs)
+    nasion, lpa, rpa, hpi, dig_points = mne.io.bti.bti._read_head_shape(hs)
     dig, t, _ = _make_bti_dig_points(nasion, lpa, rpa, hpi, dig_points)
 
     expected = {"kind", "ident", "r"}
-    found = set(reduce(lambda x, y: list(x) + list(y), [d.keys() for d in dig]))
+    found = set().union(*(d.keys() for d in dig))
     assert not expected - found
 
 
-@pytest.mark.parametrize("pdf, config, hs, exported", pdf_config_hs_exporteds)
-def test_nan_trans(pdf, config, hs, exported):
+def test_nan_trans(bti_raw):
     """Test unlikely case that the device to head transform is empty."""
-    bti_info = _read_bti_header(pdf, config, sort_by_ch_name=True)
+    pdf, config = bti_raw["pdf"], bti_raw["config"]
+    bti_info = mne.io.bti.bti._read_bti_header(pdf, config, sort_by_ch_name=True)
 
     dev_ctf_t = Transform(
         "ctf_meg", "ctf_head", _correct_trans(bti_info["bti_transform"][0])
@@ -410,7 +429,9 @@ def test_nan_trans(pdf, config, hs, exported):
             ch_name = ch.get("chan_label", ch_name)
         bti_ch_names.append(ch_name)
 
-    neuromag_ch_names = _rename_channels(bti_ch_names, ecg_ch=ecg_ch, eog_ch=eog_ch)
+    neuromag_ch_names = mne.io.bti.bti._rename_channels(
+        bti_ch_names, ecg_ch=ecg_ch, eog_ch=eog_ch
+    )
     ch_mapping = zip(bti_ch_names, neuromag_ch_names)
 
     # add some nan in some locations!
@@ -426,10 +447,9 @@ def test_nan_trans(pdf, config, hs, exported):
 
 @testing.requires_testing_data
 @pytest.mark.parametrize("fname", (fname_sim, fname_sim_filt))
-@pytest.mark.parametrize("preload", (True, False))
-def test_bti_ch_data(fname, preload):
+def test_bti_ch_data(fname):
     """Test for gh-6048."""
-    read_raw_bti(fname, preload=preload)  # used to fail with ascii decode err
+    read_raw_bti(fname, preload=False)  # used to fail with ascii decode err
 
 
 @testing.requires_testing_data
@@ -476,8 +496,10 @@ def test_bti_ecg_eog_emg(monkeypatch):
     assert len(new_names) == 13
     assert set(new_names).intersection(set(raw.ch_names)) == set()
 
+    read_bti_header = mne.io.bti.bti._read_bti_header
+
     def _read_bti_header_2(*args, **kwargs):
-        bti_info = _read_bti_header(*args, **kwargs)
+        bti_info = read_bti_header(*args, **kwargs)
         for ch_name, ch in zip(new_names, bti_info["chs"][::-1]):
             ch["chan_label"] = ch_name
         return bti_info